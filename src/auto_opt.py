@@ -90,19 +90,20 @@ def sweep_timeframe_and_regime(
 
         for ema_len in sorted(set([ema_time_consistent] + ema_candidates)):
             for slope_bps in slope_candidates:
-                trial = AppConfig(**base_cfg.model_dump())
-                trial.exchange.timeframe = tf
-                trial.strategy.lookbacks = scaled_lbs
-                trial.strategy.vol_lookback = max(5, scaled_vol)
-                trial.strategy.regime_filter.ema_len = int(max(10, ema_len))
-                trial.strategy.regime_filter.slope_min_bps_per_day = float(slope_bps)
+                d = base_cfg.model_dump()
+                d["exchange"]["timeframe"] = tf
+                d["strategy"]["lookbacks"] = scaled_lbs
+                d["strategy"]["vol_lookback"] = max(5, scaled_vol)
+                d["strategy"]["regime_filter"]["ema_len"] = int(max(10, ema_len))
+                d["strategy"]["regime_filter"]["slope_min_bps_per_day"] = float(slope_bps)
 
                 need = max(
-                    max(trial.strategy.lookbacks or [1]),
-                    trial.strategy.vol_lookback,
-                    trial.strategy.regime_filter.ema_len,
+                    max(d["strategy"]["lookbacks"] or [1]),
+                    d["strategy"]["vol_lookback"],
+                    d["strategy"]["regime_filter"]["ema_len"],
                 ) + 50
-                trial.exchange.candles_limit = max(trial.exchange.candles_limit, need, 800)
+                d["exchange"]["candles_limit"] = max(d["exchange"]["candles_limit"], need, 800)
+                trial = AppConfig(**d)
 
                 stats = run_backtest(trial, universe)
                 if not stats:
@@ -189,25 +190,28 @@ def main():
     log.info("Best config: %s", top)
 
     changed = False
-    new_cfg = AppConfig(**cfg.model_dump())
+    new_d = cfg.model_dump()
+    regime_d = new_d["strategy"]["regime_filter"]
 
     if str(cfg.exchange.timeframe).lower() != str(top["timeframe"]).lower():
         lbs_h, vol_h, ema_h = _current_hours(cfg)
         tf_min = _tf_minutes(top["timeframe"])
-        new_cfg.exchange.timeframe = str(top["timeframe"])
-        new_cfg.strategy.lookbacks = _scale_list_hours(lbs_h, tf_min)
-        new_cfg.strategy.vol_lookback = _scale_bars_from_hours(vol_h, tf_min)
-        new_cfg.strategy.regime_filter.ema_len = int(max(10, _scale_bars_from_hours(ema_h, tf_min)))
+        new_d["exchange"]["timeframe"] = str(top["timeframe"])
+        new_d["strategy"]["lookbacks"] = _scale_list_hours(lbs_h, tf_min)
+        new_d["strategy"]["vol_lookback"] = _scale_bars_from_hours(vol_h, tf_min)
+        regime_d["ema_len"] = int(max(10, _scale_bars_from_hours(ema_h, tf_min)))
         changed = True
 
-    if int(new_cfg.strategy.regime_filter.ema_len) != int(top["ema_len"]):
-        new_cfg.strategy.regime_filter.ema_len = int(top["ema_len"])
+    if int(regime_d["ema_len"]) != int(top["ema_len"]):
+        regime_d["ema_len"] = int(top["ema_len"])
         changed = True
 
-    if float(new_cfg.strategy.regime_filter.slope_min_bps_per_day) != float(top["slope_bps_per_day"]):
-        new_cfg.strategy.regime_filter.slope_min_bps_per_day = float(top["slope_bps_per_day"])
+    if float(regime_d["slope_min_bps_per_day"]) != float(top["slope_bps_per_day"]):
+        regime_d["slope_min_bps_per_day"] = float(top["slope_bps_per_day"])
         changed = True
 
+    new_cfg = AppConfig(**new_d)
+
     if not changed:
         log.info("No meaningful change vs current config; nothing to write.")
         print(df.head(10).to_string(index=False))
@@ -1,14 +1,30 @@
 # config.py — v2.0 (2025-09-02)
 from __future__ import annotations
 
-from typing import List, Optional, Tuple, Dict, Any
-from pydantic import BaseModel, Field, ValidationError
-import yaml, os
+from typing import List, Optional, Tuple, Dict, Any, FrozenSet
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, ValidationError, field_serializer
+import yaml, os, pickle, hashlib
+
+class _FrozenCfg(BaseModel):
+    """Base for all config sections: immutable once loaded.
+
+    A validated config is a pure value, so one instance can be shared by the
+    live loop, stop manager and backtests without defensive copies. Section
+    defaults without list fields (e.g. ``ScaleTriple``) are hashable and reused
+    by reference; those holding lists (e.g. ``HurstCfg``) are still copied per
+    parent. Derive variants via ``model_copy(update=...)`` or by
+    re-validating an edited ``model_dump()``.
+
+    Validator schemas are built lazily (``defer_build``) on first validation, so
+    importing this module for type hints, or loading a pickled config, never
+    pays for schema construction.
+    """
+    model_config = ConfigDict(frozen=True, defer_build=True)
 
 # -----------------------------
 # Exchange
 # -----------------------------
-class ExchangeCfg(BaseModel):
+class ExchangeCfg(_FrozenCfg):
     id: str
     account_type: str
     quote: str
@@ -25,58 +41,58 @@ class ExchangeCfg(BaseModel):
 # -----------------------------
 # Strategy filters & extras
 # -----------------------------
-class HurstCfg(BaseModel):
+class HurstCfg(_FrozenCfg):
     enabled: bool = False
     lags: List[int] = Field(default_factory=lambda: [2,4,8,16,32])
     min_h: float = 0.5
 
-class RegimeFilterCfg(BaseModel):
+class RegimeFilterCfg(_FrozenCfg):
     enabled: bool = False
     ema_len: int = 200  # Lock at 200 (roadmap: not optimized)
     slope_min_bps_per_day: float = 0.0
     use_abs: bool = False
     hurst: HurstCfg = HurstCfg()
 
-class FundingTiltCfg(BaseModel):
+class FundingTiltCfg(_FrozenCfg):
     enabled: bool = False
     weight: float = 0.0
 
-class FundingTrimCfg(BaseModel):
+class FundingTrimCfg(_FrozenCfg):
     enabled: bool = False
     threshold_bps: float = 0.0
     slope_per_bps: float = 0.0
     max_reduction: float = 0.0
 
-class DiversifyCfg(BaseModel):
+class DiversifyCfg(_FrozenCfg):
     enabled: bool = False
     corr_lookback: int = 48
     max_pair_corr: float = 0.9
 
-class VolTargetCfg(BaseModel):
+class VolTargetCfg(_FrozenCfg):
     enabled: bool = False
     target_daily_vol_bps: float = 0.0
     min_scale: float = 0.5
     max_scale: float = 2.0
 
-class EntryThrottleCfg(BaseModel):
+class EntryThrottleCfg(_FrozenCfg):
     max_new_positions_per_cycle: int = 999
     max_open_positions: int = 999
     per_symbol_trade_cooldown_min: int = 0
     min_entry_zscore: float = 0.0
 
-class SoftKillCfg(BaseModel):
+class SoftKillCfg(_FrozenCfg):
     enabled: bool = False
     soft_daily_loss_pct: float = 0.0
     resume_after_minutes: int = 0
 
 # SoftWinLockCfg removed per parameter review (dead code, not used)
 
-class AdxFilterCfg(BaseModel):
+class AdxFilterCfg(_FrozenCfg):
     """Simplified ADX filter (len fixed at 14, removed DI logic per parameter review)."""
     enabled: bool = False
     min_adx: float = 25.0  # Minimum ADX threshold (len fixed at 14, removed DI/hysteresis params)
 
-class SymbolScoreCfg(BaseModel):
+class SymbolScoreCfg(_FrozenCfg):
     """
     Simplified symbol scoring (12 params → 4 params per parameter review).
     
@@ -92,34 +108,47 @@ class SymbolScoreCfg(BaseModel):
     pf_threshold: float = 1.2  # Profit factor threshold
     ban_hours: int = 24  # Renamed from ban_minutes (converted to hours)
 
-class SymbolFilterCfg(BaseModel):
+def _sorted_or_none(v):
+    """Dump frozenset fields as sorted lists so configs stay YAML/JSON friendly."""
+    return sorted(v) if v is not None else None
+
+class SymbolFilterCfg(_FrozenCfg):
     enabled: bool = True
-    whitelist: List[str] | None = None
-    banlist: List[str] | None = None
+    # frozensets: membership is tested per symbol every cycle
+    whitelist: FrozenSet[str] | None = None
+    banlist: FrozenSet[str] | None = None
     ban_minutes_after_loss: int = 0
     score: SymbolScoreCfg = SymbolScoreCfg()
 
-class TimeOfDayWhitelistCfg(BaseModel):
+    @field_serializer("whitelist", "banlist")
+    def _dump_sets(self, v):
+        return _sorted_or_none(v)
+
+class TimeOfDayWhitelistCfg(_FrozenCfg):
     enabled: bool = False
     use_ema: bool = True
     ema_alpha: float = 0.2
     min_trades_per_hour: int = 5
     min_hours_allowed: int = 6
     threshold_bps: float = 0.0  # interpreted as USDT/trade in live.py
-    fixed_hours: List[int] | None = None
+    fixed_hours: FrozenSet[int] | None = None
     downweight_factor: float = 0.6
     # NEW optional boosters
     boost_good_hours: bool = False
     boost_factor: float = 1.0
-    fixed_good_hours: List[int] | None = None
+    fixed_good_hours: FrozenSet[int] | None = None
+
+    @field_serializer("fixed_hours", "fixed_good_hours")
+    def _dump_sets(self, v):
+        return _sorted_or_none(v)
 
-class LiquidityCapsCfg(BaseModel):
+class LiquidityCapsCfg(_FrozenCfg):
     enabled: bool = False
     max_weight_low_liq: float = 0.02
     symbols_low_liq: List[str] = Field(default_factory=list)
 
 # NEW: Majors regime guard
-class MajorsRegimeCfg(BaseModel):
+class MajorsRegimeCfg(_FrozenCfg):
     enabled: bool = False
     majors: List[str] = Field(default_factory=lambda: ["BTC/USDT:USDT","ETH/USDT:USDT"])
     ema_len: int = 200
@@ -128,14 +157,14 @@ class MajorsRegimeCfg(BaseModel):
     downweight_factor: float = 0.6
 
 # NEW: Kelly-style conviction scaling
-class KellyCfg(BaseModel):
+class KellyCfg(_FrozenCfg):
     enabled: bool = False
     base_frac: float = 0.5
     half_kelly: bool = True
     min_scale: float = 0.5
     max_scale: float = 1.6
 
-class StrategyCfg(BaseModel):
+class StrategyCfg(_FrozenCfg):
     signal_power: float = 1.35
     lookbacks: List[int] = Field(default_factory=lambda: [12,24,48,96])
     lookback_weights: List[float] = Field(default_factory=lambda: [0.4,0.3,0.2,0.1])
@@ -197,30 +226,30 @@ class StrategyCfg(BaseModel):
 # -----------------------------
 # Liquidity
 # -----------------------------
-class LiquidityCfg(BaseModel):
+class LiquidityCfg(_FrozenCfg):
     adv_cap_pct: float = 0.0
     notional_cap_usdt: float = 0.0
 
 # -----------------------------
 # Execution
 # -----------------------------
-class SpreadGuardCfg(BaseModel):
+class SpreadGuardCfg(_FrozenCfg):
     enabled: bool = False
     max_spread_bps: float = 15.0
     skip_if_wider: bool = True
 
-class DynamicOffsetCfg(BaseModel):
+class DynamicOffsetCfg(_FrozenCfg):
     enabled: bool = False
     base_bps: float = 3.0
     per_spread_coeff: float = 0.5
     max_offset_bps: float = 20.0
 
-class MicrostructureCfg(BaseModel):
+class MicrostructureCfg(_FrozenCfg):
     enabled: bool = False
     min_obi: float = 0.15
     max_spread_bps: float = 8.0
 
-class StaleOrdersCfg(BaseModel):
+class StaleOrdersCfg(_FrozenCfg):
     enabled: bool = False
     cleanup_interval_sec: int = 60
     max_age_sec: int = 180
@@ -228,7 +257,7 @@ class StaleOrdersCfg(BaseModel):
     cancel_if_not_targeted: bool = True
     keep_reduce_only: bool = True
 
-class ExecutionCfg(BaseModel):
+class ExecutionCfg(_FrozenCfg):
     reload_positions_on_start: bool = True
     order_type: str = "limit"
     post_only: bool = True
@@ -258,52 +287,58 @@ class ExecutionCfg(BaseModel):
 # -----------------------------
 # Risk
 # -----------------------------
-class TrailingUnlocksCfg(BaseModel):
+class TrailingUnlocksCfg(_FrozenCfg):
     enabled: bool = False
     triggers_r: List[float] = Field(default_factory=list)
     lock_r: List[float] = Field(default_factory=list)
 
-class ExitOnRegimeFlipCfg(BaseModel):
+class ExitOnRegimeFlipCfg(_FrozenCfg):
     enabled: bool = False
     confirm_bars: int = 1
 
-class AdaptiveRiskCfg(BaseModel):
+class ScaleTriple(_FrozenCfg):
+    """Per-volatility-tier multipliers; YAML stays a {low, mid, high} mapping (missing tiers = 1.0)."""
+    low: float = 1.0
+    mid: float = 1.0
+    high: float = 1.0
+
+class AdaptiveRiskCfg(_FrozenCfg):
     enabled: bool = False
     low_thr_bps: float = 40.0
     high_thr_bps: float = 120.0
-    sl_scale: Dict[str, float] = Field(default_factory=lambda: {"low":1.4, "mid":1.0, "high":0.8})
-    trail_scale: Dict[str, float] = Field(default_factory=lambda: {"low":1.2, "mid":1.0, "high":0.8})
-    ladder_r_scale: Dict[str, float] = Field(default_factory=lambda: {"low":1.1, "mid":1.0, "high":0.9})
+    sl_scale: ScaleTriple = ScaleTriple(low=1.4, mid=1.0, high=0.8)
+    trail_scale: ScaleTriple = ScaleTriple(low=1.2, mid=1.0, high=0.8)
+    ladder_r_scale: ScaleTriple = ScaleTriple(low=1.1, mid=1.0, high=0.9)
 
-class PartialLaddersCfg(BaseModel):
+class PartialLaddersCfg(_FrozenCfg):
     enabled: bool = False
     r_levels: List[float] = Field(default_factory=list)
     sizes: List[float] = Field(default_factory=list)
     reduce_only: bool = True
 
-class ProfitTargetCfg(BaseModel):
+class ProfitTargetCfg(_FrozenCfg):
     """R-multiple profit target configuration."""
     r_multiple: float  # R-multiple threshold (e.g., 2.0 for 2R)
     exit_pct: float  # Percentage of position to exit at this level (e.g., 0.5 for 50%)
 
-class ProfitTargetsCfg(BaseModel):
+class ProfitTargetsCfg(_FrozenCfg):
     """Explicit R-multiple profit targets (roadmap improvement)."""
     enabled: bool = False
     targets: List[ProfitTargetCfg] = Field(default_factory=list)
 
-class ProfitLockCfg(BaseModel):
+class ProfitLockCfg(_FrozenCfg):
     enabled: bool = False
     triggers_r: List[float] = Field(default_factory=list)
     lock_to_r: List[float] = Field(default_factory=list)
 
-class NoProgressCfg(BaseModel):
+class NoProgressCfg(_FrozenCfg):
     enabled: bool = False
     min_minutes: int = 20
     min_rr: float = 0.3
     # min_close_pnl_pct removed per parameter review (dead code)
     # tiers removed per parameter review (dead code)
 
-class DataCfg(BaseModel):
+class DataCfg(_FrozenCfg):
     """Configuration for historical data fetching and pagination."""
     max_candles_per_request: int = 1000  # Bybit's per-request limit
     max_candles_total: int = 50000  # Safety cap per symbol/timeframe
@@ -327,7 +362,7 @@ class DataCfg(BaseModel):
         "spike_zscore_threshold": 5.0,
     })
 
-class OptimizerCfg(BaseModel):
+class OptimizerCfg(_FrozenCfg):
     """Configuration for optimizer deployment decisions and OOS sample size requirements."""
     # Minimum OOS sample size requirements for deployment decisions
     oos_min_bars_for_deploy: int = 200  # Minimum OOS bars required before trusting Sharpe for deployment
@@ -353,7 +388,7 @@ class OptimizerCfg(BaseModel):
     bad_combo_min_score: float = -1.0  # Below this score = bad combo
     bad_combo_dd_threshold: float = 0.3  # 30% DD = bad combo
 
-class RiskCfg(BaseModel):
+class RiskCfg(_FrozenCfg):
     atr_len: int = 28
     atr_mult_sl: float = 2.0
     # atr_mult_tp removed per parameter review (dead code)
@@ -446,19 +481,20 @@ class RiskCfg(BaseModel):
 # -----------------------------
 # Paths, logging, costs
 # -----------------------------
-class PathsCfg(BaseModel):
+class PathsCfg(_FrozenCfg):
     state_path: str
     logs_dir: str
     metrics_path: Optional[str] = None
 
-class LoggingCfg(BaseModel):
+class LoggingCfg(_FrozenCfg):
     level: str = "INFO"
     file_max_mb: int = 20
     file_backups: int = 5
 
-class CostsCfg(BaseModel):
-    maker_fee_bps: float = 1.0
-    taker_fee_bps: float = 5.0
+class CostsCfg(_FrozenCfg):
+    # Legacy keys maker_bps/taker_bps are accepted as aliases (canonical name wins)
+    maker_fee_bps: float = Field(1.0, validation_alias=AliasChoices("maker_fee_bps", "maker_bps"))
+    taker_fee_bps: float = Field(5.0, validation_alias=AliasChoices("taker_fee_bps", "taker_bps"))
     slippage_bps: float = 2.0
     borrow_bps: float = 0.0
     maker_fill_ratio: float = 0.5
@@ -466,7 +502,7 @@ class CostsCfg(BaseModel):
 # -----------------------------
 # Notifications
 # -----------------------------
-class DiscordCfg(BaseModel):
+class DiscordCfg(_FrozenCfg):
     enabled: bool = False
     send_optimizer_results: bool = True
     send_daily_report: bool = True
@@ -474,7 +510,7 @@ class DiscordCfg(BaseModel):
     # NOTE: This is the actual webhook; do NOT commit this to a public repo.
     webhook_url: Optional[str] = None
 
-class MonitoringCfg(BaseModel):
+class MonitoringCfg(_FrozenCfg):
     """Monitoring and alerting configuration."""
     no_trade: Dict[str, Any] = Field(default_factory=lambda: {
         "enabled": True,
@@ -486,11 +522,11 @@ class MonitoringCfg(BaseModel):
         "alert_threshold_pct": 20.0,  # Alert if costs exceed backtest by N%
     })
 
-class NotificationsCfg(BaseModel):
+class NotificationsCfg(_FrozenCfg):
     discord: DiscordCfg = DiscordCfg()
     monitoring: MonitoringCfg = MonitoringCfg()
 
-class AppConfig(BaseModel):
+class AppConfig(_FrozenCfg):
     exchange: ExchangeCfg
     strategy: StrategyCfg
     liquidity: LiquidityCfg
@@ -550,7 +586,7 @@ def _merge_defaults(raw: Dict[str, Any]) -> Dict[str, Any]:
     raw.setdefault("paths", {})
     raw["paths"].setdefault("metrics_path", None)
 
-    raw.setdefault("costs", {})
+    raw["costs"] = raw.get("costs") or {}
 
     raw.setdefault("notifications", {})
     raw["notifications"].setdefault("discord", {})
@@ -583,27 +619,97 @@ def _merge_defaults(raw: Dict[str, Any]) -> Dict[str, Any]:
 
     return raw
 
-def load_config(yaml_path: str) -> AppConfig:
+# In-process cache: abs path -> ((st_mtime_ns, st_size), validated AppConfig).
+# Configs are frozen, so handing the same instance to every caller is safe.
+_CFG_CACHE: Dict[str, Tuple[Tuple[int, int], AppConfig]] = {}
+
+# libyaml-backed loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+def _pickle_path(yaml_path: str) -> str:
+    return yaml_path + ".pkl"
+
+def _pickle_key(yaml_bytes: bytes) -> Tuple[str, Tuple[int, int]]:
+    """Identity of a pickled config: sha256 of the YAML text plus this schema module's (mtime_ns, size).
+
+    Compared for equality, never newer-than: deploys/rollbacks use shutil.copy2,
+    which carries the source file's (older) mtime over to the live YAML.
+    """
+    st = os.stat(__file__)
+    return hashlib.sha256(yaml_bytes).hexdigest(), (st.st_mtime_ns, st.st_size)
+
+def _load_pickled_config(yaml_path: str, key: Tuple[str, Tuple[int, int]]) -> Optional[AppConfig]:
+    """Return the pickled AppConfig if it was built from exactly this YAML and schema."""
+    try:
+        with open(_pickle_path(yaml_path), "rb") as f:
+            stored_key, cfg = pickle.load(f)
+    except Exception:
+        return None
+    if stored_key != key or not isinstance(cfg, AppConfig):
+        return None
+    return cfg
+
+def _store_pickled_config(yaml_path: str, key: Tuple[str, Tuple[int, int]], cfg: AppConfig) -> None:
+    """Best-effort write of the validated config next to the YAML (atomic rename)."""
+    pkl = _pickle_path(yaml_path)
+    tmp = f"{pkl}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump((key, cfg), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, pkl)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+def load_config(yaml_path: str, use_cache: bool = False) -> AppConfig:
+    """
+    Load, default-merge and validate a YAML config.
+
+    With ``use_cache=True`` the validated config is pickled to ``<yaml>.pkl`` and
+    reused on the next call (e.g. bot restarts) while the YAML content and
+    ``config.py`` are unchanged, skipping YAML parsing and validation.
+
+    Within a process, repeat loads of an unchanged file (same mtime and size)
+    return the same ``AppConfig`` instance for the cost of a ``stat``.
+    """
     path = os.path.abspath(yaml_path)
-    if not os.path.exists(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
         raise FileNotFoundError(f"Config YAML not found: {path}")
 
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _CFG_CACHE.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+
+    cfg = _load_config_uncached(path, use_cache)
+    _CFG_CACHE[path] = (key, cfg)
+    return cfg
+
+def _load_config_uncached(path: str, use_cache: bool) -> AppConfig:
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    key = None
+    if use_cache:
+        key = _pickle_key(raw)
+        cached = _load_pickled_config(path, key)
+        if cached is not None:
+            return cached
+
+    data = yaml.load(raw.decode("utf-8"), Loader=_YamlLoader) or {}
 
     data = _merge_defaults(data)
-    # === PATCH: costs back-compat ===
-    costs = (data.get("costs") or {})
-    if "maker_fee_bps" not in costs and "maker_bps" in costs:
-        costs["maker_fee_bps"] = costs.get("maker_bps")
-    if "taker_fee_bps" not in costs and "taker_bps" in costs:
-        costs["taker_fee_bps"] = costs.get("taker_bps")
-    data["costs"] = costs
-    
 
     try:
         cfg = AppConfig(**data)
     except ValidationError as e:
         raise RuntimeError(f"Invalid config.yaml: {e}")
 
+    if use_cache:
+        _store_pickled_config(path, key, cfg)
+
     return cfg
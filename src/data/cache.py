@@ -6,21 +6,72 @@ Provides persistent storage for OHLCV data to reduce API calls.
 from __future__ import annotations
 
 import logging
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
-from datetime import datetime, timezone
+import numpy as np
 import pandas as pd
 
 log = logging.getLogger("data.cache")
 
+# Fixed SQL text (no per-call string building) so every call hits the
+# connection's prepared-statement cache.
+_STATEMENT_CACHE_SIZE = 256
+# Read-only connections for get_ohlcv (WAL: many readers alongside the single writer)
+_READ_POOL_SIZE = 8
+# Bars per stored chunk: a store only rewrites the chunks its bars overlap, so appending
+# to a long series costs O(chunk + batch) instead of O(history)
+_CHUNK_BARS = 4096
+# Open-ended window bounds for get_ohlcv(start_ts=None / end_ts=None)
+_TS_MIN, _TS_MAX = -(1 << 63), (1 << 63) - 1
+
+# Chunks of one series never overlap, so "overlaps [?3, ?4]" selects a contiguous run
+_CHUNK_WINDOW = "symbol = ?1 AND timeframe = ?2 AND end_ts >= ?3 AND start_ts <= ?4"
+_SELECT_CHUNKS_SQL = f"SELECT n, data FROM ohlcv_chunk WHERE {_CHUNK_WINDOW} ORDER BY start_ts"
+_DELETE_CHUNKS_SQL = f"DELETE FROM ohlcv_chunk WHERE {_CHUNK_WINDOW}"
+# The ts prefix is only read for chunks the requested window cuts into
+_CACHED_RANGE_SQL = (
+    "SELECT start_ts, end_ts, n, "
+    "CASE WHEN ?3 <= start_ts AND ?4 >= end_ts THEN NULL ELSE substr(data, 1, n * 8) END "
+    f"FROM ohlcv_chunk WHERE {_CHUNK_WINDOW} ORDER BY start_ts"
+)
+_INSERT_CHUNK_SQL = (
+    "INSERT INTO ohlcv_chunk (symbol, timeframe, start_ts, end_ts, n, data) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+def _pack(ts: np.ndarray, vals: np.ndarray) -> memoryview:
+    """Pack bars column-wise (SoA): int64 ts[n] followed by float64 open/high/low/close/volume[n] each.
+
+    Columns are written straight into one preallocated buffer, which sqlite3
+    binds as the BLOB parameter without an intermediate bytes copy.
+    """
+    n = len(ts)
+    buf = np.empty(6 * n, dtype="<f8")
+    buf[:n].view("<i8")[:] = ts
+    buf[n:].reshape(5, n)[:] = vals
+    return memoryview(buf).cast("B")
+
+
+def _unpack(n: int, data: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Inverse of _pack: zero-copy views (ts[n], vals[5, n]) over the blob."""
+    ts = np.frombuffer(data, dtype="<i8", count=n)
+    vals = np.frombuffer(data, dtype="<f8", count=5 * n, offset=8 * n).reshape(5, n)
+    return ts, vals
+
 
 class OHLCVCache:
     """
     SQLite-based cache for OHLCV historical data.
     
-    Stores bars with (symbol, timeframe, timestamp) as primary key.
-    Supports gap-filling and TTL awareness.
+    Each (symbol, timeframe) series is stored as non-overlapping chunks of up to
+    _CHUNK_BARS bars, each a contiguous column-wise blob (see _pack). A read is a
+    few row fetches plus a binary search on the timestamp column instead of one
+    B-tree row per bar; a write only rewrites the chunks its bars touch.
     """
     
     def __init__(self, db_path: str | Path):
@@ -32,36 +83,148 @@ class OHLCVCache:
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        self.conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+        )
+        self._write_lock = threading.Lock()
+        self._read_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._read_conns: List[sqlite3.Connection] = []
+        self._read_pool_lock = threading.Lock()
+        self._configure_connection()
         self._create_tables()
         log.info(f"OHLCVCache initialized at {self.db_path}")
     
+    def _configure_connection(self):
+        """Tune the connection for bulk OHLCV writes (WAL, relaxed fsync, in-memory temp)."""
+        _apply_pragmas(self.conn, (
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            "PRAGMA temp_store=MEMORY",
+            "PRAGMA cache_size=-65536",      # 64 MiB page cache
+            "PRAGMA mmap_size=268435456",    # 256 MiB memory-mapped reads
+        ))
+    
+    def _open_reader(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path.resolve().as_uri() + "?mode=ro",  # as_uri() escapes ?, # and % in the path
+            uri=True,
+            check_same_thread=False,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+        )
+        _apply_pragmas(conn, (
+            "PRAGMA cache_size=-16384",      # 16 MiB page cache per reader
+            "PRAGMA mmap_size=268435456",
+        ))
+        return conn
+    
+    @contextmanager
+    def _reader(self):
+        """Borrow a read-only connection, opening up to _READ_POOL_SIZE on demand."""
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            with self._read_pool_lock:
+                opened = len(self._read_conns) < _READ_POOL_SIZE
+                if opened:
+                    conn = self._open_reader()
+                    self._read_conns.append(conn)
+            if not opened:
+                conn = self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+    
     def _create_tables(self):
-        """Create cache table if it doesn't exist."""
+        """Create cache table if it doesn't exist (migrating the legacy per-bar table)."""
         cursor = self.conn.cursor()
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ohlcv (
+            CREATE TABLE IF NOT EXISTS ohlcv_chunk (
                 symbol TEXT NOT NULL,
                 timeframe TEXT NOT NULL,
-                ts INTEGER NOT NULL,
-                open REAL NOT NULL,
-                high REAL NOT NULL,
-                low REAL NOT NULL,
-                close REAL NOT NULL,
-                volume REAL NOT NULL,
+                start_ts INTEGER NOT NULL,
+                end_ts INTEGER NOT NULL,
+                n INTEGER NOT NULL,
+                data BLOB NOT NULL,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (symbol, timeframe, ts)
+                PRIMARY KEY (symbol, timeframe, start_ts)
             )
         """)
+        self.conn.commit()
+        self._migrate_row_table()
+    
+    def _migrate_row_table(self):
+        """One-time move of bars from the old per-bar `ohlcv` table into ohlcv_chunk."""
+        legacy = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ohlcv'"
+        ).fetchone()
+        if not legacy:
+            return
         
-        # Index for efficient range queries
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_symbol_tf_ts 
-            ON ohlcv(symbol, timeframe, ts)
-        """)
+        with self._write_lock, self.conn:
+            series = self.conn.execute("SELECT DISTINCT symbol, timeframe FROM ohlcv").fetchall()
+            for symbol, timeframe in series:
+                rows = self.conn.execute(
+                    "SELECT ts, open, high, low, close, volume FROM ohlcv "
+                    "WHERE symbol = ? AND timeframe = ? ORDER BY ts ASC",
+                    (symbol, timeframe),
+                ).fetchall()
+                self._merge_and_write(symbol, timeframe, np.asarray(rows, dtype=np.float64))
+            self.conn.execute("DROP TABLE ohlcv")
+        log.info(f"OHLCVCache migrated {len(series)} series to chunked storage")
+    
+    @staticmethod
+    def _read_chunks(
+        conn: sqlite3.Connection, symbol: str, timeframe: str, lo: int, hi: int,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(ts[n], vals[5, n]) of every chunk overlapping [lo, hi], in ts order; None if there are none."""
+        rows = conn.execute(_SELECT_CHUNKS_SQL, (symbol, timeframe, lo, hi)).fetchall()
+        if not rows:
+            return None
+        if len(rows) == 1:
+            return _unpack(rows[0][0], rows[0][1])
+        parts = [_unpack(n, data) for n, data in rows]
+        return (
+            np.concatenate([ts for ts, _ in parts]),
+            np.concatenate([vals for _, vals in parts], axis=1),
+        )
+    
+    def _merge_and_write(self, symbol: str, timeframe: str, arr: np.ndarray):
+        """Merge (N, 6) bars into the stored series (new bars win on equal ts).
+
+        Only the chunks overlapping the new bars' ts range are read, deleted and
+        rewritten, so appending the latest bars touches just the tail chunk.
+        Caller must hold _write_lock and an open transaction.
+        """
+        new_ts = arr[:, 0].astype(np.int64)
+        new_vals = arr[:, 1:6].T
+        window = (symbol, timeframe, int(new_ts.min()), int(new_ts.max()))
         
-        self.conn.commit()
+        existing = self._read_chunks(self.conn, *window)
+        if existing is not None:
+            old_ts, old_vals = existing
+            ts = np.concatenate([old_ts, new_ts])
+            vals = np.concatenate([old_vals, new_vals], axis=1)
+            self.conn.execute(_DELETE_CHUNKS_SQL, window)
+        else:
+            ts, vals = new_ts, new_vals
+        
+        # Stable sort keeps later (newer) bars after older duplicates; keep the last of each ts
+        order = np.argsort(ts, kind="stable")
+        ts, vals = ts[order], vals[:, order]
+        keep = np.ones(len(ts), dtype=bool)
+        keep[:-1] = ts[1:] != ts[:-1]
+        ts, vals = ts[keep], vals[:, keep]
+        
+        # The merged run spans exactly the deleted chunks plus the new bars, so
+        # re-splitting it keeps chunks disjoint
+        rows = []
+        for k in range(0, len(ts), _CHUNK_BARS):
+            c_ts, c_vals = ts[k:k + _CHUNK_BARS], vals[:, k:k + _CHUNK_BARS]
+            rows.append((symbol, timeframe, int(c_ts[0]), int(c_ts[-1]), len(c_ts), _pack(c_ts, c_vals)))
+        self.conn.executemany(_INSERT_CHUNK_SQL, rows)
     
     def get_ohlcv(
         self,
@@ -69,7 +232,7 @@ class OHLCVCache:
         timeframe: str,
         start_ts: Optional[int] = None,
         end_ts: Optional[int] = None,
-    ) -> List[List]:
+    ) -> np.ndarray:
         """
         Retrieve OHLCV data from cache.
         
@@ -80,30 +243,24 @@ class OHLCVCache:
             end_ts: End timestamp (milliseconds, optional)
         
         Returns:
-            List of bars in CCXT format: [[ts, open, high, low, close, volume], ...]
+            float64 array of shape (N, 6) with columns ts, open, high, low, close, volume
+            (use to_ccxt_bars() where CCXT-style lists are needed)
         """
-        cursor = self.conn.cursor()
-        
-        query = "SELECT ts, open, high, low, close, volume FROM ohlcv WHERE symbol = ? AND timeframe = ?"
-        params = [symbol, timeframe]
-        
-        if start_ts is not None:
-            query += " AND ts >= ?"
-            params.append(start_ts)
-        
-        if end_ts is not None:
-            query += " AND ts <= ?"
-            params.append(end_ts)
-        
-        query += " ORDER BY ts ASC"
-        
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        lo = _TS_MIN if start_ts is None else int(start_ts)
+        hi = _TS_MAX if end_ts is None else int(end_ts)
+        with self._reader() as conn:
+            series = self._read_chunks(conn, symbol, timeframe, lo, hi)
+        if series is None:
+            return np.empty((0, 6), dtype=np.float64)
+        ts, vals = series
         
-        # Convert to CCXT format: [[ts, open, high, low, close, volume], ...]
-        bars = [[row["ts"], row["open"], row["high"], row["low"], row["close"], row["volume"]] for row in rows]
+        i = 0 if start_ts is None else int(np.searchsorted(ts, start_ts, side="left"))
+        j = len(ts) if end_ts is None else int(np.searchsorted(ts, end_ts, side="right"))
         
-        return bars
+        out = np.empty((max(j - i, 0), 6), dtype=np.float64)
+        out[:, 0] = ts[i:j]
+        out[:, 1:] = vals[:, i:j].T
+        return out
     
     def store_ohlcv(self, symbol: str, timeframe: str, bars: List[List]):
         """
@@ -114,22 +271,15 @@ class OHLCVCache:
             timeframe: Timeframe (e.g., "1h")
             bars: List of bars in CCXT format: [[ts, open, high, low, close, volume], ...]
         """
-        if not bars:
+        if not len(bars):
             return
         
-        cursor = self.conn.cursor()
+        arr = np.asarray(bars, dtype=np.float64)
         
-        # Use INSERT OR REPLACE to handle duplicates
-        cursor.executemany("""
-            INSERT OR REPLACE INTO ohlcv 
-            (symbol, timeframe, ts, open, high, low, close, volume, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, [
-            (symbol, timeframe, bar[0], bar[1], bar[2], bar[3], bar[4], bar[5], datetime.now(timezone.utc).isoformat())
-            for bar in bars
-        ])
+        # One transaction for the read-merge-write (commits on success, rolls back on error)
+        with self._write_lock, self.conn:
+            self._merge_and_write(symbol, timeframe, arr)
         
-        self.conn.commit()
         log.debug(f"Stored {len(bars)} bars for {symbol} {timeframe}")
     
     def get_cached_range(
@@ -145,24 +295,51 @@ class OHLCVCache:
         Returns:
             Tuple of (cached_start_ts, cached_end_ts) or (None, None) if no cache
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT MIN(ts) as min_ts, MAX(ts) as max_ts
-            FROM ohlcv
-            WHERE symbol = ? AND timeframe = ? AND ts >= ? AND ts <= ?
-        """, (symbol, timeframe, start_ts, end_ts))
-        
-        row = cursor.fetchone()
-        if row and row["min_ts"] is not None and row["max_ts"] is not None:
-            return (int(row["min_ts"]), int(row["max_ts"]))
-        return (None, None)
+        first = last = None
+        for chunk_start, chunk_end, n, ts_blob in self.conn.execute(
+            _CACHED_RANGE_SQL, (symbol, timeframe, start_ts, end_ts)
+        ):
+            if ts_blob is None:
+                # Chunk lies wholly inside the window: its stored bounds are the answer
+                lo, hi = chunk_start, chunk_end
+            else:
+                ts = np.frombuffer(ts_blob, dtype="<i8", count=n)
+                i = int(np.searchsorted(ts, start_ts, side="left"))
+                j = int(np.searchsorted(ts, end_ts, side="right"))
+                if i >= j:
+                    continue
+                lo, hi = int(ts[i]), int(ts[j - 1])
+            if first is None:
+                first = lo
+            last = hi
+        return (first, last)
     
     def close(self):
-        """Close database connection."""
+        """Close database connections."""
+        with self._read_pool_lock:
+            for conn in self._read_conns:
+                conn.close()
+            self._read_conns.clear()
         self.conn.close()
         log.info(f"OHLCVCache connection closed for {self.db_path}")
 
 
+def _apply_pragmas(conn: sqlite3.Connection, pragmas: Tuple[str, ...]):
+    for pragma in pragmas:
+        try:
+            conn.execute(pragma)
+        except sqlite3.DatabaseError as e:
+            log.debug(f"{pragma} not applied: {e}")
+
+
+def to_ccxt_bars(arr: np.ndarray) -> List[List]:
+    """Convert a get_ohlcv() array to CCXT format: [[ts(int), open, high, low, close, volume], ...]."""
+    bars = arr.tolist()
+    for bar in bars:
+        bar[0] = int(bar[0])
+    return bars
+
+
 def get_cache_instance(db_path: str | Path) -> Optional[OHLCVCache]:
     """
     Factory function to get cache instance if enabled.
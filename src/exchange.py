@@ -1,20 +1,111 @@
 # v1.6.4 – 2025-09-04 (CCXT-only; added fetch_order_book wrapper)
 from __future__ import annotations
+import heapq
 import logging
 import os
+import threading
 import time
-from typing import Any, Dict, Iterable, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-import ccxt
 import pandas as pd
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 from .config import ExchangeCfg
 from .risk_controller import APICircuitBreaker
-from .data.cache import get_cache_instance, OHLCVCache
+from .data.cache import get_cache_instance, to_ccxt_bars, OHLCVCache
 from .data.validator import validate_ohlcv
 
 log = logging.getLogger("exchange")
 
+# Workers in the shared I/O pool. Their HTTP round trips overlap, but request starts stay
+# rateLimit apart: ccxt's sync throttle() is unlocked, so each wrapper serializes it (see
+# _serialized_throttle), and a rate-limit error holds every worker off for _RATE_LIMIT_PAUSE_S.
+_IO_POOL_WORKERS = 8
+_RATE_LIMIT_PAUSE_S = 1.0
+
+# Position size fields in probe order; ccxt's normalized "contracts" is what Bybit fills
+# (contractSize is the per-contract multiplier, not a size, so it is never probed)
+_POS_QTY_KEYS = ("contracts", "positionAmt", "size", "amount")
+
+# Reuse window for fetch_markets_filtered(): startup paths call it back to back, and
+# 24h volume/last price do not move enough within it to change the universe
+_UNIVERSE_TTL_S = 30.0
+
+def _ccxt():
+    """Deferred ccxt import: the package loads every exchange module (~0.5s), which
+    modules that only import this one for types (backtests, optimizer workers) never need."""
+    import ccxt
+    return ccxt
+
+
+def _is_network_error(e: BaseException) -> bool:
+    return isinstance(e, _ccxt().NetworkError)
+
+
+def _is_rate_limit(e: BaseException) -> bool:
+    # Bybit's retCode 10006 ("too many visits") is not always mapped to RateLimitExceeded
+    msg = str(e)
+    return isinstance(e, _ccxt().RateLimitExceeded) or "rate limit" in msg.lower() or "10006" in msg
+
+
+# Transient-failure retry for public endpoints: full-jitter exponential backoff (up to 8s) so
+# concurrent callers don't retry in lockstep after a 429; only network-class errors
+# (timeouts, rate limits, exchange unavailable) are retried, not bad symbols/params.
+# reraise: callers see the last ccxt error itself (e.g. RateLimitExceeded), not a RetryError.
+_retry_network = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_random_exponential(multiplier=1, max=8),
+    retry=retry_if_exception(_is_network_error),
+    reraise=True,
+)
+
+
+def market_specs(m: dict, decimal_places: bool = False) -> Dict[str, Any]:
+    """
+    Decode order-sizing limits from a CCXT market dict.
+    decimal_places: the exchange reports precision as digit counts (ccxt DECIMAL_PLACES)
+    rather than tick sizes (TICK_SIZE, ccxt's default).
+    Returns: {amount_step, amount_min, min_notional, integer_amount}
+    """
+    specs = {"amount_step": 0.0, "amount_min": 0.0, "min_notional": 0.0, "integer_amount": False}
+    limits = m.get("limits", {}) or {}
+    amt = limits.get("amount", {}) or {}
+    cost = limits.get("cost", {}) or {}
+    prec = m.get("precision", {}) or {}
+    info = m.get("info", {}) or {}
+
+    # CCXT normalized (if present)
+    if amt.get("step") is not None:
+        try: specs["amount_step"] = float(amt["step"])
+        except Exception: pass
+    if amt.get("min") is not None:
+        try: specs["amount_min"]  = float(amt["min"])
+        except Exception: pass
+    if cost.get("min") is not None:
+        try: specs["min_notional"] = float(cost["min"])
+        except Exception: pass
+
+    # Bybit native lot filter
+    lsf = info.get("lotSizeFilter") or {}
+    for k in ("qtyStep", "minOrderQty"):
+        v = lsf.get(k)
+        if v is not None:
+            try:
+                v = float(v)
+                if k == "qtyStep" and (specs["amount_step"] == 0.0 or v > specs["amount_step"]):
+                    specs["amount_step"] = v
+                if k == "minOrderQty" and (specs["amount_min"] == 0.0 or v > specs["amount_min"]):
+                    specs["amount_min"] = v
+            except Exception:
+                pass
+
+    # Whole-unit lots only when the lot step says so. contractSize is the per-contract
+    # multiplier (1 on every Bybit linear perp), not a lot size.
+    p_amt = prec.get("amount")
+    whole_precision = p_amt == 0 if decimal_places else (p_amt is not None and p_amt >= 1)
+    specs["integer_amount"] = bool(specs["amount_step"] >= 1 or whole_precision)
+    return specs
+
 
 class ExchangeWrapper:
     """
@@ -33,6 +124,19 @@ class ExchangeWrapper:
         """
         self.cfg = cfg
         self.data_cfg = data_cfg
+        # symbol -> decoded market_specs(); both caches reset when ccxt's markets change
+        self._meta_cache: Dict[str, Dict[str, Any]] = {}
+        self._markets_snapshot: Optional[dict] = None
+        self._base_universe: Optional[List[str]] = None  # symbols passing metadata-only filters
+        self._universe_cache: Optional[Tuple[float, List[str]]] = None  # (monotonic ts, universe)
+        # Shared pool for overlapping blocking ccxt calls; created on first use
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        # Set by close(); wakes any pagination/backoff pause so shutdown isn't held up
+        self._stop_evt = threading.Event()
+        # Serializes ccxt's throttle across threads; _throttle_until (monotonic) gates all
+        # requests after a rate-limit error
+        self._throttle_lock = threading.Lock()
+        self._throttle_until = 0.0
         
         # Initialize OHLCV cache if enabled
         self.cache: Optional[OHLCVCache] = None
@@ -63,7 +167,7 @@ class ExchangeWrapper:
         if not api_key or not secret:
             log.warning("API keys missing. Private endpoints may fail; equity may appear as 0.")
 
-        klass = getattr(ccxt, cfg.id)
+        klass = getattr(_ccxt(), cfg.id)
         self.x = klass({
             "apiKey": api_key,
             "secret": secret,
@@ -75,9 +179,33 @@ class ExchangeWrapper:
         })
         if cfg.testnet and hasattr(self.x, "set_sandbox_mode"):
             self.x.set_sandbox_mode(True)
+        # market_specs() needs to know how ccxt encodes precision for this exchange
+        self._decimal_places = getattr(self.x, "precisionMode", None) == _ccxt().DECIMAL_PLACES
+        # fetch2() calls self.throttle(cost); the instance attribute shadows the class method
+        self.x.throttle = self._serialized_throttle(self.x.throttle)
+
+        # Keep-alive pool sized for the shared I/O pool plus the main/fast-SL threads, so
+        # concurrent calls reuse TLS connections instead of discarding overflow sockets
+        session = getattr(self.x, "session", None)
+        if session is not None and hasattr(session, "mount"):
+            # Imported here: requests is only loaded once ccxt is (see _ccxt)
+            from requests.adapters import HTTPAdapter
+            session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=_IO_POOL_WORKERS + 4))
+
+        # Order placement path is fixed by account type; bind it once
+        self._place_order = self._place_swap if cfg.account_type == "swap" else self._place_spot
+
+        # Capability flags are static per exchange class; resolve once
+        has = getattr(self.x, "has", {}) or {}
+        # Bound once: None when the exchange can't set leverage
+        self._set_leverage_fn = getattr(self.x, "set_leverage", None) if has.get("setLeverage") else None
+        self._has_fetch_funding_rates = bool(has.get("fetchFundingRates"))
+        self._has_fetch_funding_rate = bool(has.get("fetchFundingRate"))
 
         # Bybit UTA hints
         self.unified_margin = bool(getattr(cfg, "unified_margin", False))
+        # fetch_balance params are fixed per account mode (ccxt treats params as read-only)
+        self._balance_params: Dict[str, Any] = {"accountType": "UNIFIED"} if self.unified_margin else {}
         if self.x.id == "bybit" and self.unified_margin:
             opts = getattr(self.x, "options", {}) or {}
             opts.update({
@@ -103,29 +231,56 @@ class ExchangeWrapper:
 
     # ------------------------ Markets / Universe ------------------------
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=8))
+    @_retry_network
     def load_markets(self):
-        return self.x.load_markets()
+        markets = self.x.load_markets()
+        # ccxt returns its cached dict unless it actually reloaded; only then drop derived caches
+        if markets is not self._markets_snapshot:
+            self._markets_snapshot = markets
+            self._meta_cache.clear()
+            self._base_universe = None
+            self._universe_cache = None
+        return markets
+
+    def get_symbol_specs(self, symbol: str) -> Dict[str, Any]:
+        """Order-sizing limits for `symbol`, decoded from ccxt market metadata once per load_markets()."""
+        specs = self._meta_cache.get(symbol)
+        if specs is None:
+            specs = market_specs(self.x.market(symbol), self._decimal_places)
+            self._meta_cache[symbol] = specs
+        return dict(specs)  # callers adjust amount_min in place
+
+    def _base_universe_symbols(self, markets: dict) -> List[str]:
+        """Symbols passing the metadata-only filters; computed once per markets snapshot."""
+        if self._base_universe is not None:
+            return self._base_universe
+
+        quote = self.cfg.quote
+        if self.cfg.only_perps:
+            symbols = [
+                sym for sym, m in markets.items()
+                if m.get("active") is True and m.get("quote") == quote
+                and m.get("swap") is True
+                and (m.get("type") == "swap" or m.get("contract", False))
+                and m.get("settle") in (quote, None) and m.get("linear", True)
+            ]
+        else:
+            symbols = [
+                sym for sym, m in markets.items()
+                if m.get("active") is True and m.get("spot") is True and m.get("quote") == quote
+            ]
+        self._base_universe = symbols
+        return symbols
 
     def fetch_markets_filtered(self) -> List[str]:
-        markets = self.load_markets()
-        symbols: List[str] = []
-
-        for sym, m in markets.items():
-            if m.get("active") is not True:
-                continue
-            if self.cfg.only_perps:
-                if (m.get("swap") is True) and m.get("quote") == self.cfg.quote:
-                    if m.get("type") == "swap" or m.get("contract", False):
-                        if m.get("settle") in (self.cfg.quote, None) and m.get("linear", True):
-                            symbols.append(sym)
-            else:
-                if m.get("spot") is True and m.get("quote") == self.cfg.quote:
-                    symbols.append(sym)
-
+        # The market-metadata pass is reused per markets snapshot; the ticker pass for _UNIVERSE_TTL_S
+        symbols = self._base_universe_symbols(self.load_markets())
+        cached = self._universe_cache
+        if cached is not None and time.monotonic() - cached[0] < _UNIVERSE_TTL_S:
+            return list(cached[1])
         if not symbols:
             log.warning("No symbols after basic market filters.")
-            return symbols
+            return []
 
         try:
             ticks = self.x.fetch_tickers(symbols)
@@ -133,23 +288,27 @@ class ExchangeWrapper:
             log.warning(f"fetch_tickers failed: {e}")
             return []
 
+        min_price = self.cfg.min_price
+        min_qv = self.cfg.min_usd_volume_24h
         keep = []
         for s in symbols:
-            t = ticks.get(s, {}) or {}
+            t = ticks.get(s) or {}
             last = t.get("last") or t.get("close") or 0.0
-            qv = t.get("quoteVolume", 0.0) or 0.0
-            if (last or 0) >= self.cfg.min_price and qv >= self.cfg.min_usd_volume_24h:
+            if last >= min_price and (t.get("quoteVolume") or 0.0) >= min_qv:
                 keep.append(s)
 
-        keep = sorted(keep)
-        if self.cfg.max_symbols and len(keep) > self.cfg.max_symbols:
-            keep = keep[: self.cfg.max_symbols]
+        max_symbols = self.cfg.max_symbols
+        if max_symbols and len(keep) > max_symbols:
+            keep = heapq.nsmallest(max_symbols, keep)
+        else:
+            keep.sort()
         log.info(f"Universe after filters: {len(keep)} symbols")
-        return keep
+        self._universe_cache = (time.monotonic(), keep)
+        return list(keep)
 
     # ------------------------ Market Data ------------------------
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=8))
+    @_retry_network
     def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int, since: Optional[int] = None):
         """
         Fetch OHLCV data with automatic pagination for limits > 1000.
@@ -172,7 +331,7 @@ class ExchangeWrapper:
         if self.cache and since is not None:
             # Try to get from cache
             cached_bars = self.cache.get_ohlcv(symbol, timeframe, start_ts=since)
-            if cached_bars and len(cached_bars) >= limit:
+            if len(cached_bars) >= max(limit, 1):
                 # Validate cached data
                 if self.data_cfg and self.data_cfg.validation.get("enabled", True):
                     val_result = validate_ohlcv(
@@ -183,7 +342,7 @@ class ExchangeWrapper:
                     )
                     if val_result.is_valid():
                         log.debug(f"[CACHE] Using {len(cached_bars)} cached bars for {symbol}")
-                        return cached_bars[:limit]
+                        return to_ccxt_bars(cached_bars[:limit])
                     else:
                         log.warning(f"[CACHE] Cached data failed validation for {symbol}, fetching fresh")
         
@@ -267,14 +426,15 @@ class ExchangeWrapper:
                 # Rate limiting: Add a small delay between pagination requests to avoid hitting rate limits
                 # CCXT's enableRateLimit helps, but we need extra delay for pagination bursts
                 if remaining > 0:  # Only delay if we have more chunks to fetch
-                    time.sleep(0.2)  # 200ms delay between pagination chunks
+                    if self._pause(0.2):  # 200ms delay between pagination chunks
+                        break
                 
             except Exception as e:
                 log.warning(f"Pagination chunk failed for {symbol}: {e}")
                 # If rate limit error, wait longer before retrying
                 if "rate limit" in str(e).lower() or "10006" in str(e):
                     log.warning(f"Rate limit hit for {symbol}, waiting 2 seconds before retry...")
-                    time.sleep(2.0)
+                    self._pause(2.0)
                 break
         
         # Combine chunks: chunks are in reverse order (newest first), so reverse and concatenate
@@ -320,7 +480,24 @@ class ExchangeWrapper:
                 log.debug(f"[CACHE] Failed to store {symbol}: {e}")
         
         return all_bars
-    
+
+    def fetch_ohlcv_many(self, symbols: Iterable[str], timeframe: str, limit: int) -> Dict[str, list]:
+        """
+        fetch_ohlcv for many symbols, fanned out on the shared I/O pool.
+
+        Returns {symbol: bars} in input order; symbols whose fetch failed are logged and
+        omitted. A rate-limit failure pauses the remaining requests (see _note_rate_limit).
+        """
+        def _one(s: str):
+            try:
+                return s, self.fetch_ohlcv(s, timeframe, limit=limit)
+            except Exception as e:
+                log.warning(f"OHLCV {s} failed: {e}")
+                self._note_rate_limit(e)
+                return s, None
+
+        return {s: bars for s, bars in self._io_map(_one, list(symbols)) if bars is not None}
+
     def fetch_ohlcv_range(
         self,
         symbol: str,
@@ -384,11 +561,12 @@ class ExchangeWrapper:
         all_bars = []
         if self.cache:
             try:
-                cached_bars = self.cache.get_ohlcv(symbol, timeframe, start_ts=start_ts, end_ts=end_ts)
-                if cached_bars:
+                cached = self.cache.get_ohlcv(symbol, timeframe, start_ts=start_ts, end_ts=end_ts)
+                if len(cached):
+                    cached_bars = to_ccxt_bars(cached)
                     # Check if cache covers the full range
-                    cached_start = cached_bars[0][0] if cached_bars else None
-                    cached_end = cached_bars[-1][0] if cached_bars else None
+                    cached_start = cached_bars[0][0]
+                    cached_end = cached_bars[-1][0]
                     
                     if cached_start and cached_end:
                         # If cache covers full range, use it
@@ -471,7 +649,8 @@ class ExchangeWrapper:
                     
                     # Rate limiting
                     if current_since <= end_ts and len(all_bars) < max_candles:
-                        time.sleep(throttle_ms / 1000.0)
+                        if self._pause(throttle_ms / 1000.0):
+                            break
                 else:
                     break
                 
@@ -479,7 +658,8 @@ class ExchangeWrapper:
                 log.warning(f"Pagination chunk failed for {symbol} at {pd.Timestamp(current_since, unit='ms', tz='UTC')}: {e}")
                 if "rate limit" in str(e).lower() or "10006" in str(e):
                     log.warning(f"Rate limit hit for {symbol}, waiting 2 seconds...")
-                    time.sleep(2.0)
+                    if self._pause(2.0):
+                        break
                 else:
                     break
         
@@ -520,6 +700,38 @@ class ExchangeWrapper:
         
         return all_bars
     
+    def _pause(self, seconds: float) -> bool:
+        """Interruptible sleep; returns True if close() was called (caller should stop)."""
+        return self._stop_evt.wait(seconds)
+
+    def _serialized_throttle(self, throttle):
+        """Wrap ccxt's throttle so concurrent callers are spaced rateLimit apart.
+
+        ccxt reads lastRestRequestTimestamp without a lock and only stamps it after
+        throttle() returns, so pooled threads would all see the same gap and fire
+        together. Here the wait and the stamp happen under one lock.
+        """
+        x, lock = self.x, self._throttle_lock
+
+        def _throttle(cost=None):
+            with lock:
+                hold = self._throttle_until - time.monotonic()
+                if hold > 0:
+                    self._pause(hold)
+                throttle(cost)
+                x.lastRestRequestTimestamp = x.milliseconds()
+
+        return _throttle
+
+    def _note_rate_limit(self, e: BaseException) -> bool:
+        """On a rate-limit error, hold every request off for _RATE_LIMIT_PAUSE_S; True if it was one."""
+        if not _is_rate_limit(e):
+            return False
+        # Plain store, no lock: the throttle lock may be held for a whole pause
+        self._throttle_until = max(self._throttle_until, time.monotonic() + _RATE_LIMIT_PAUSE_S)
+        log.warning(f"Rate limit hit; pausing requests for {_RATE_LIMIT_PAUSE_S:.0f}s")
+        return True
+
     def _timeframe_to_ms(self, timeframe: str) -> Optional[int]:
         """Convert timeframe string to milliseconds."""
         # Common timeframes
@@ -557,26 +769,42 @@ class ExchangeWrapper:
     def fetch_funding_rates(self, symbols: List[str]) -> Dict[str, float]:
         out: Dict[str, float] = {}
         try:
-            if hasattr(self.x, "fetch_funding_rates"):
+            if self._has_fetch_funding_rates:
                 data = self.x.fetch_funding_rates(symbols)
-                for d in data or []:
+                # ccxt returns {symbol: rate_info}; older builds returned a list
+                for d in (data.values() if isinstance(data, dict) else data or []):
                     sym = d.get("symbol")
                     rate = float(d.get("fundingRate") or 0.0)
                     if sym:
                         out[sym] = rate
-            elif hasattr(self.x, "fetch_funding_rate"):
-                for s in symbols:
-                    d = self.x.fetch_funding_rate(s)
-                    out[s] = float(d.get("fundingRate") or 0.0)
+            elif self._has_fetch_funding_rate:
+                # One request per symbol, fanned out on the shared I/O pool
+                def _one(s: str):
+                    try:
+                        return s, float(self.x.fetch_funding_rate(s).get("fundingRate") or 0.0)
+                    except Exception as e:
+                        self._note_rate_limit(e)
+                        log.warning(f"fetch_funding_rate({s}) failed: {e}")
+                        return s, None
+
+                for s, rate in self._io_map(_one, symbols):
+                    if rate is not None:
+                        out[s] = rate
         except Exception as e:
             log.debug(f"fetch_funding_rates failed: {e}")
         return out
 
+    def _io_map(self, fn, items: Iterable) -> Iterable:
+        """Run a blocking call per item on the shared I/O pool (results in input order)."""
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=_IO_POOL_WORKERS, thread_name_prefix="exchange-io")
+        return self._io_pool.map(fn, items)
+
     # ------------------------ Account / Positions ------------------------
 
     def get_equity_usdt(self) -> float:
         try:
-            bal = self.x.fetch_balance(params={"accountType": "UNIFIED"} if self.unified_margin else {})
+            bal = self.x.fetch_balance(params=self._balance_params)
             total = bal.get("total", {})
             usdt_equity = float(total.get("USDT", 0.0))
             if usdt_equity == 0.0:
@@ -600,7 +828,7 @@ class ExchangeWrapper:
             or None if unavailable
         """
         try:
-            bal = self.x.fetch_balance(params={"accountType": "UNIFIED"} if self.unified_margin else {})
+            bal = self.x.fetch_balance(params=self._balance_params)
             
             # Try standard CCXT structure
             total = bal.get("total", {})
@@ -640,54 +868,55 @@ class ExchangeWrapper:
             return None
 
     def fetch_positions(self) -> Dict[str, dict]:
-        consolidated: Dict[str, dict] = {}
+        # symbol -> [long_qty, short_qty, entryPrice]; dicts are only built once at the end
+        agg: Dict[str, List[float]] = {}
         try:
             raw = self.x.fetch_positions() or []
             if self.circuit_breaker:
                 self.circuit_breaker.record_success()
+            _float, _abs = float, abs  # hoisted for the per-position loop
             for p in raw:
-                s = p.get("symbol")
+                get = p.get
+                s = get("symbol")
                 if not s:
                     continue
-                side = (p.get("side") or "").lower()
-                qty = float(p.get("contracts") or p.get("contractSize") or p.get("positionAmt") or 0.0)
+                side = (get("side") or "").lower()
+                qty = 0.0
+                for k in _POS_QTY_KEYS:
+                    v = get(k)
+                    if v:
+                        qty = _float(v)
+                        break
                 ep = None
                 try:
-                    ep = float(p.get("entryPrice") or 0.0) or None
+                    ep = _float(get("entryPrice") or 0.0) or None
                 except Exception:
                     ep = None
-                c = consolidated.setdefault(
-                    s,
-                    {"long_qty": 0.0, "short_qty": 0.0, "net_qty": 0.0, "entryPrice": None},
-                )
-                if side == "long":
-                    c["long_qty"] += abs(qty)
-                elif side == "short":
-                    c["short_qty"] += abs(qty)
-                else:
-                    if qty > 0:
-                        c["long_qty"] += abs(qty)
-                    elif qty < 0:
-                        c["short_qty"] += abs(qty)
+                a = agg.get(s)
+                if a is None:
+                    a = agg[s] = [0.0, 0.0, 0.0]
+                # Explicit side wins; one-way (sideless) rows are signed by qty
+                if side == "long" or (side != "short" and qty > 0):
+                    a[0] += _abs(qty)
+                elif side == "short" or qty < 0:
+                    a[1] += _abs(qty)
                 if ep:
-                    c["entryPrice"] = ep
-            for s, c in consolidated.items():
-                c["net_qty"] = float(c["long_qty"]) - float(c["short_qty"])
-                if c["entryPrice"] is None:
-                    c["entryPrice"] = 0.0
-            return consolidated
+                    a[2] = ep
         except Exception as e:
             log.debug(f"fetch_positions error: {e}")
             if self.circuit_breaker:
                 self.circuit_breaker.record_error()
-            return consolidated
+        return {
+            s: {"long_qty": lq, "short_qty": sq, "net_qty": lq - sq, "entryPrice": ep}
+            for s, (lq, sq, ep) in agg.items()
+        }
 
     # ------------------------ Trading ------------------------
 
     def set_leverage(self, symbol: str, lev: int):
         try:
-            if hasattr(self.x, "set_leverage"):
-                self.x.set_leverage(lev, symbol, params={"buyLeverage": lev, "sellLeverage": lev})
+            if self._set_leverage_fn is not None:
+                self._set_leverage_fn(lev, symbol, params={"buyLeverage": lev, "sellLeverage": lev})
         except Exception as e:
             log.debug(f"set_leverage({symbol},{lev}) failed: {e}")
 
@@ -709,23 +938,24 @@ class ExchangeWrapper:
             return None
 
         params: Dict[str, Any] = {"reduceOnly": reduce_only}
+        if price is not None:
+            params["postOnly"] = post_only
         try:
-            if self.cfg.account_type == "swap":
-                if price is None:
-                    return self.x.create_order(symbol, "market", side.lower(), abs(size), None, params)
-                else:
-                    params["postOnly"] = post_only
-                    return self.x.create_order(symbol, "limit", side.lower(), abs(size), float(price), params)
-            else:
-                if price is None:
-                    return self.x.create_market_order(symbol, side.lower(), abs(size), params=params)
-                else:
-                    params["postOnly"] = post_only
-                    return self.x.create_limit_order(symbol, side.lower(), abs(size), float(price), params)
+            return self._place_order(symbol, side.lower(), abs(size), price, params)
         except Exception as e:
             log.debug(f"create_order failed: {e}")
             raise
 
+    def _place_swap(self, symbol: str, side: str, amount: float, price: Optional[float], params: Dict[str, Any]):
+        if price is None:
+            return self.x.create_order(symbol, "market", side, amount, None, params)
+        return self.x.create_order(symbol, "limit", side, amount, float(price), params)
+
+    def _place_spot(self, symbol: str, side: str, amount: float, price: Optional[float], params: Dict[str, Any]):
+        if price is None:
+            return self.x.create_market_order(symbol, side, amount, params=params)
+        return self.x.create_limit_order(symbol, side, amount, float(price), params)
+
     # ---- Open Orders helpers (used by startup cancel and ops) ----
 
     def fetch_open_orders(self, symbol: Optional[str] = None) -> List[dict]:
@@ -757,7 +987,22 @@ class ExchangeWrapper:
     # ------------------------ Cleanup ------------------------
 
     def close(self):
+        self._stop_evt.set()
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=False)
+            self._io_pool = None
+        # The OHLCV cache holds a writer plus up to _READ_POOL_SIZE reader connections
+        if self.cache is not None:
+            try:
+                self.cache.close()
+            except Exception as e:
+                log.debug("OHLCV cache close failed: %r", e)
+            self.cache = None
+        # Sync ccxt has no close(); its pooled HTTP connections live on a requests.Session
+        closer = getattr(self.x, "close", None) or getattr(getattr(self.x, "session", None), "close", None)
+        if closer is None:
+            return
         try:
-            self.x.close()
-        except Exception:
-            pass
+            closer()
+        except Exception as e:
+            log.debug("ExchangeWrapper.close failed: %r", e)
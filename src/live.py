@@ -10,6 +10,7 @@ import logging
 import threading
 import time
 import math
+from decimal import Decimal
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
@@ -54,7 +55,7 @@ def _exec_spread_guard_ok(bid: float, ask: float, cfg) -> bool:
     max_spread = float(getattr(sg, "max_spread_bps", 15.0))
     return spread_bps <= max_spread
 
-from .exchange import ExchangeWrapper
+from .exchange import ExchangeWrapper, market_specs
 from .signals import compute_atr, regime_ok, dynamic_k, _filter_by_meta
 from .sizing import build_targets, apply_liquidity_caps, apply_kelly_scaling
 from .regime_router import build_targets_auto, decide_mode
@@ -73,7 +74,27 @@ log = logging.getLogger("live")
 
 # -------------------- config bridge for carry --------------------
 
+# AppConfig is frozen, so anything derived from it is computed once per instance
+# and reused every cycle instead of re-dumping/re-parsing the whole tree.
+_CFG_DERIVED: Dict[str, tuple] = {}
+
+def _per_cfg(key: str, cfg: AppConfig, build):
+    hit = _CFG_DERIVED.get(key)
+    if hit is not None and hit[0] is cfg:
+        return hit[1]
+    val = build(cfg)
+    _CFG_DERIVED[key] = (cfg, val)
+    return val
+
 def _cfg_to_dict(cfg: AppConfig) -> dict:
+    """Plain-dict view of the (frozen) AppConfig, shared across cycles; treat as read-only."""
+    return _per_cfg("dict", cfg, _cfg_to_dict_uncached)
+
+def _carry_cfg(cfg: AppConfig):
+    """Shared CarryCfg parsed once per AppConfig instance."""
+    return _per_cfg("carry", cfg, lambda c: parse_carry_cfg(_cfg_to_dict(c)))
+
+def _cfg_to_dict_uncached(cfg: AppConfig) -> dict:
     """Convert pydantic AppConfig to a plain dict for parse_carry_cfg, with fallbacks."""
     try:
         return cfg.model_dump()  # pydantic v2
@@ -108,7 +129,9 @@ def _cfg_to_dict(cfg: AppConfig) -> dict:
 
 # -------------------- microstructure / helpers --------------------
 
-def _micro_ok(cfg: AppConfig, tkr: dict, orderbook: dict | None) -> bool:
+def _micro_ok(cfg: AppConfig, tkr: dict, orderbook: dict | None, fetch_book=None) -> bool:
+    """Spread + order-book-imbalance gate. With `fetch_book`, the book is only requested
+    once the ticker spread check has passed."""
     mc = getattr(cfg.execution, "microstructure", None)
     if not mc or not getattr(mc, "enabled", False):
         return True
@@ -120,6 +143,8 @@ def _micro_ok(cfg: AppConfig, tkr: dict, orderbook: dict | None) -> bool:
         spread_bps = 10000.0 * (ask - bid) / ((ask + bid) / 2.0)
         if spread_bps > float(getattr(mc, "max_spread_bps", 8.0)):
             return False
+        if orderbook is None and fetch_book is not None:
+            orderbook = fetch_book()
         if orderbook and (bids := orderbook.get("bids")) and (asks := orderbook.get("asks")):
             bvol = sum([float(x[1]) for x in bids[:5]])
             avol = sum([float(x[1]) for x in asks[:5]])
@@ -280,41 +305,7 @@ def _get_symbol_specs(ex, sym: str, state: dict | None = None) -> dict:
             m = ex.exchange.market(sym)
         except Exception:
             m = None
-    specs = {"amount_step": 0.0, "amount_min": 0.0, "min_notional": 0.0, "integer_amount": False}
-    if m:
-        limits = m.get("limits", {}) or {}
-        amt = limits.get("amount", {}) or {}
-        cost = limits.get("cost", {}) or {}
-        prec = m.get("precision", {}) or {}
-        info = m.get("info", {}) or {}
-
-        # CCXT normalized (if present)
-        if amt.get("step") is not None:
-            try: specs["amount_step"] = float(amt["step"])
-            except Exception: pass
-        if amt.get("min") is not None:
-            try: specs["amount_min"]  = float(amt["min"])
-            except Exception: pass
-        if cost.get("min") is not None:
-            try: specs["min_notional"] = float(cost["min"])
-            except Exception: pass
-
-        # Bybit native lot filter
-        lsf = info.get("lotSizeFilter") or {}
-        for k in ("qtyStep", "minOrderQty"):
-            v = lsf.get(k)
-            if v is not None:
-                try:
-                    v = float(v)
-                    if k == "qtyStep" and (specs["amount_step"] == 0.0 or v > specs["amount_step"]):
-                        specs["amount_step"] = v
-                    if k == "minOrderQty" and (specs["amount_min"] == 0.0 or v > specs["amount_min"]):
-                        specs["amount_min"] = v
-                except Exception:
-                    pass
-
-        # Some listings are integer contracts (e.g., 1000BTT)
-        specs["integer_amount"] = bool(prec.get("amount") == 0 or m.get("contractSize") == 1)
+    specs = market_specs(m) if m else {"amount_step": 0.0, "amount_min": 0.0, "min_notional": 0.0, "integer_amount": False}
 
     # Apply learned cache if larger
     if cache_min and (specs["amount_min"] == 0.0 or specs["amount_min"] < cache_min):
@@ -326,9 +317,12 @@ def _quantize_amount(qty: float, step: float, integer_amount: bool) -> float:
     if qty <= 0:
         return 0.0
     if integer_amount:
-        return float(int(math.floor(qty)))
+        # Whole units, but still on the lot grid (e.g. qtyStep 100)
+        step = max(step or 0.0, 1.0)
     if step and step > 0:
-        return math.floor(qty / step) * step
+        # Floor on the decimal values (shortest repr) so 0.3 / 0.1 stays 3 steps, not 2.999...
+        d_step = Decimal(repr(step))
+        return float((Decimal(repr(qty)) // d_step) * d_step)
     return qty
 
 
@@ -423,7 +417,7 @@ def _update_symbol_score_on_close(state: dict, cfg: AppConfig, symbol: str, pnl_
     
     s["last_update"] = pd.Timestamp.utcnow().isoformat()
 
-    wl = set((sf_cfg.whitelist or []))
+    wl = sf_cfg.whitelist or frozenset()
     if symbol in wl:
         s["status"] = "active"
         s["ban_until"] = None
@@ -452,8 +446,8 @@ def _apply_symbol_filter_to_targets(state: dict, cfg: AppConfig, targets: pd.Ser
         return targets
 
     stats = _state_get_symstats(state)
-    ban_static = set((sf_cfg.banlist or []))
-    wl = set((sf_cfg.whitelist or []))
+    ban_static = sf_cfg.banlist or frozenset()
+    wl = sf_cfg.whitelist or frozenset()
 
     out = targets.copy()
     now = pd.Timestamp.utcnow()
@@ -606,15 +600,7 @@ class FastSLTPThread(threading.Thread):
             tier = "low"
         elif atrp_bps >= high:
             tier = "high"
-        def _pick(obj, key, default=1.0):
-            try:
-                return float(getattr(obj, key).get(tier, default))
-            except Exception:
-                return default
-        sl_scale = _pick(ad, "sl_scale", 1.0)
-        trail_scale = _pick(ad, "trail_scale", 1.0)
-        ladd_scale = _pick(ad, "ladder_r_scale", 1.0)
-        return sl_scale, trail_scale, ladd_scale
+        return getattr(ad.sl_scale, tier), getattr(ad.trail_scale, tier), getattr(ad.ladder_r_scale, tier)
 
     def _minutes_held(self, symbol: str) -> float:
         entered_iso = self.state.get("enter_bar_time", {}).get(symbol)
@@ -1599,9 +1585,10 @@ def run_live(cfg: AppConfig, dry: bool = False):
             # 1) OHLCV
             bars: Dict[str, pd.DataFrame] = {}
             syms = ex.fetch_markets_filtered()
-            for i, s in enumerate(syms):
+            # Fetched on the exchange's I/O pool (throttled and rate-limit aware there)
+            raw_by_sym = ex.fetch_ohlcv_many(syms, cfg.exchange.timeframe, cfg.exchange.candles_limit)
+            for s, raw in raw_by_sym.items():
                 try:
-                    raw = ex.fetch_ohlcv(s, cfg.exchange.timeframe, limit=cfg.exchange.candles_limit)
                     df = pd.DataFrame(raw, columns=["ts","open","high","low","close","volume"])
                     df["dt"] = pd.to_datetime(df["ts"], unit="ms", utc=True)
                     df.set_index("dt", inplace=True)
@@ -1614,14 +1601,6 @@ def run_live(cfg: AppConfig, dry: bool = False):
                         bars[s] = df
                 except Exception as e:
                     log.warning(f"OHLCV {s} failed: {e}")
-                    # If rate limit error, add extra delay before next symbol
-                    if "rate limit" in str(e).lower() or "10006" in str(e):
-                        log.warning(f"Rate limit detected, waiting 1 second before next symbol...")
-                        time.sleep(1.0)
-                
-                # Add small delay between symbols to avoid rate limits (except for last symbol)
-                if i < len(syms) - 1:
-                    time.sleep(0.1)  # 100ms delay between symbols
 
             if not bars:
                 log.error("No bars fetched this cycle; sleeping.")
@@ -1635,8 +1614,8 @@ def run_live(cfg: AppConfig, dry: bool = False):
                 keep = []
                 for s in list(bars.keys()):
                     tkr = tkr_map.get(s, {}) or {}
-                    ob = ex.fetch_order_book(s, limit=10)
-                    if _micro_ok(cfg, tkr, ob):
+                    # OBI reads 5 levels; books are only pulled for symbols that pass the spread check
+                    if _micro_ok(cfg, tkr, None, fetch_book=lambda s=s: ex.fetch_order_book(s, limit=5)):
                         keep.append(s)
                 bars = {k: bars[k] for k in keep if k in bars}
                 removed = [s for s in tkr_map.keys() if s not in keep] if isinstance(tkr_map, dict) else []
@@ -2001,7 +1980,7 @@ def run_live(cfg: AppConfig, dry: bool = False):
 
             # >>> CARRY/BASIS SLEEVE: build after momentum gates, before portfolio scaler
             try:
-                carry_cfg = parse_carry_cfg(_cfg_to_dict(cfg))
+                carry_cfg = _carry_cfg(cfg)
                 if carry_cfg.enabled:
                     w_mom = targets.copy()
 
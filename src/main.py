@@ -80,7 +80,7 @@ def _run_backtest_flow(cfg):
 
 def main():
     args = parse_args()
-    cfg = load_config(args.config)
+    cfg = load_config(args.config, use_cache=True)
     log.info(f"Starting {args.mode} loop (dry={args.dry}) using config={args.config} [import_mode={MODE}]")
     if args.mode == "live":
         run_live(cfg, dry=args.dry)
@@ -92,25 +92,27 @@ def run_timeframe_sweep(
     for tf in timeframes:
         tf_min = _tf_to_minutes(tf)
 
-        # Clone config and adjust timeframe
-        trial = AppConfig(**base_cfg.model_dump())
-        trial.exchange.timeframe = tf
+        # Clone config (as a plain dict; AppConfig is frozen) and adjust timeframe
+        d = base_cfg.model_dump()
+        ex_d, st_d = d["exchange"], d["strategy"]
+        ex_d["timeframe"] = tf
 
         # Scale params (keep the *information window* roughly consistent across TFs)
         if scale_lookbacks:
-            trial.strategy.lookbacks = _scale_bars_from_hours(base_lb_hours, tf_min)
+            st_d["lookbacks"] = _scale_bars_from_hours(base_lb_hours, tf_min)
         if scale_vol:
-            trial.strategy.vol_lookback = int(max(5, _scale_bars_from_hours([base_vol_hours], tf_min)[0]))
+            st_d["vol_lookback"] = int(max(5, _scale_bars_from_hours([base_vol_hours], tf_min)[0]))
         if scale_regime_ema:
-            trial.strategy.regime_filter.ema_len = int(max(10, _scale_bars_from_hours([base_ema_hours], tf_min)[0]))
+            st_d["regime_filter"]["ema_len"] = int(max(10, _scale_bars_from_hours([base_ema_hours], tf_min)[0]))
 
         # Determine candles needed and prefetch
         need = max(
-            max(trial.strategy.lookbacks or [1]),
-            trial.strategy.vol_lookback,
-            trial.strategy.regime_filter.ema_len,
+            max(st_d["lookbacks"] or [1]),
+            st_d["vol_lookback"],
+            st_d["regime_filter"]["ema_len"],
         ) + margin_bars
-        trial.exchange.candles_limit = max(trial.exchange.candles_limit, need, min_candles)
+        ex_d["candles_limit"] = max(ex_d["candles_limit"], need, min_candles)
+        trial = AppConfig(**d)
 
         ex_tf = ExchangeWrapper(trial.exchange, data_cfg=base_cfg.data)
         try:
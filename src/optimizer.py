@@ -42,33 +42,43 @@ def _param_grid() -> List[Dict]:
     return grids
 
 def _apply_params(dst: AppConfig, p: Dict) -> AppConfig:
-    cfg = dst.model_copy(deep=True)
-    cfg.strategy.lookbacks = p["lookbacks"]
-    cfg.strategy.lookback_weights = p["weights"]
-    cfg.strategy.vol_lookback = p["vol_lookback"]
-    cfg.strategy.k_min = p["k_min"]
-    cfg.strategy.k_max = p["k_max"]
-    cfg.strategy.gross_leverage = p["gross_leverage"]
-    cfg.strategy.max_weight_per_asset = p["max_weight_per_asset"]
-    cfg.strategy.entry_zscore_min = p["entry_zscore_min"]
-
-    cfg.strategy.regime_filter.enabled = True
-    cfg.strategy.regime_filter.ema_len = p["ema_len"]
-    cfg.strategy.regime_filter.slope_min_bps_per_day = p["regime_bps"]
-    cfg.strategy.regime_filter.use_abs = p["regime_abs"]
-
-    cfg.strategy.funding_tilt.enabled = True
-    cfg.strategy.funding_tilt.weight = p["funding_weight"]
-
-    cfg.strategy.diversify.enabled = p["diversify"]
-    cfg.strategy.diversify.corr_lookback = p["corr_lookback"]
-    cfg.strategy.diversify.max_pair_corr = p["max_pair_corr"]
-
-    cfg.strategy.vol_target.enabled = p["vol_target"]
-    cfg.strategy.vol_target.target_daily_vol_bps = p["target_daily_vol_bps"]
-    cfg.strategy.vol_target.min_scale = p["vt_min"]
-    cfg.strategy.vol_target.max_scale = p["vt_max"]
-    return cfg
+    s = dst.strategy
+    strategy = s.model_copy(update={
+        "lookbacks": p["lookbacks"],
+        "lookback_weights": p["weights"],
+        "vol_lookback": p["vol_lookback"],
+        "k_min": p["k_min"],
+        "k_max": p["k_max"],
+        "gross_leverage": p["gross_leverage"],
+        "max_weight_per_asset": p["max_weight_per_asset"],
+        "entry_zscore_min": p["entry_zscore_min"],
+
+        "regime_filter": s.regime_filter.model_copy(update={
+            "enabled": True,
+            "ema_len": p["ema_len"],
+            "slope_min_bps_per_day": p["regime_bps"],
+            "use_abs": p["regime_abs"],
+        }),
+
+        "funding_tilt": s.funding_tilt.model_copy(update={
+            "enabled": True,
+            "weight": p["funding_weight"],
+        }),
+
+        "diversify": s.diversify.model_copy(update={
+            "enabled": p["diversify"],
+            "corr_lookback": p["corr_lookback"],
+            "max_pair_corr": p["max_pair_corr"],
+        }),
+
+        "vol_target": s.vol_target.model_copy(update={
+            "enabled": p["vol_target"],
+            "target_daily_vol_bps": p["target_daily_vol_bps"],
+            "min_scale": p["vt_min"],
+            "max_scale": p["vt_max"],
+        }),
+    })
+    return dst.model_copy(update={"strategy": strategy})
 
 def optimize(cfg: AppConfig) -> Tuple[Dict, Dict[str, float]]:
     ex = ExchangeWrapper(cfg.exchange)
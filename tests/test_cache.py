@@ -0,0 +1,90 @@
+import sqlite3
+
+import pytest
+
+from src.data import cache as cache_mod
+from src.data.cache import OHLCVCache, to_ccxt_bars
+
+H = 3_600_000
+
+def _bars(ts, base=100.0):
+    return [[int(t), base, base + 1, base - 1, base + 0.5, 10.0] for t in ts]
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # Force multi-chunk series with a handful of bars
+    monkeypatch.setattr(cache_mod, "_CHUNK_BARS", 4)
+
+@pytest.fixture
+def cache(tmp_path):
+    c = OHLCVCache(tmp_path / "ohlcv.db")
+    yield c
+    c.close()
+
+def test_migrates_legacy_per_bar_table(tmp_path):
+    db = tmp_path / "ohlcv.db"
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE ohlcv (symbol TEXT, timeframe TEXT, ts INTEGER, open REAL, high REAL, "
+        "low REAL, close REAL, volume REAL, PRIMARY KEY (symbol, timeframe, ts))"
+    )
+    conn.executemany(
+        "INSERT INTO ohlcv VALUES ('BTC/USDT:USDT', '1h', ?, ?, ?, ?, ?, ?)",
+        [tuple(b) for b in _bars([2 * H, 0, H])],
+    )
+    conn.commit()
+    conn.close()
+
+    c = OHLCVCache(db)
+    try:
+        assert to_ccxt_bars(c.get_ohlcv("BTC/USDT:USDT", "1h")) == _bars([0, H, 2 * H])
+        tables = {r[0] for r in c.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert "ohlcv" not in tables
+    finally:
+        c.close()
+
+def test_newer_bars_win_on_equal_ts(cache, small_chunks):
+    cache.store_ohlcv("BTC/USDT:USDT", "1h", _bars(range(0, 10 * H, H), base=100.0))
+    cache.store_ohlcv("BTC/USDT:USDT", "1h", _bars(range(8 * H, 12 * H, H), base=200.0))
+    out = cache.get_ohlcv("BTC/USDT:USDT", "1h")
+    assert out[:, 0].tolist() == list(range(0, 12 * H, H))
+    assert out[:8, 1].tolist() == [100.0] * 8
+    assert out[8:, 1].tolist() == [200.0] * 4
+
+def test_backfill_between_chunks_keeps_series_sorted(cache, small_chunks):
+    cache.store_ohlcv("BTC/USDT:USDT", "1h", _bars(range(20 * H, 30 * H, H)))
+    cache.store_ohlcv("BTC/USDT:USDT", "1h", _bars(range(0, 5 * H, H)))
+    cache.store_ohlcv("BTC/USDT:USDT", "1h", _bars(range(3 * H, 22 * H, H), base=300.0))
+    out = cache.get_ohlcv("BTC/USDT:USDT", "1h")
+    assert out[:, 0].tolist() == list(range(0, 30 * H, H))
+    assert out[3:22, 1].tolist() == [300.0] * 19
+
+def test_get_ohlcv_slices_start_end_inclusive(cache, small_chunks):
+    cache.store_ohlcv("BTC/USDT:USDT", "1h", _bars(range(0, 20 * H, H)))
+    out = cache.get_ohlcv("BTC/USDT:USDT", "1h", start_ts=5 * H, end_ts=13 * H)
+    assert out.shape == (9, 6)
+    assert out[0, 0] == 5 * H and out[-1, 0] == 13 * H
+    assert cache.get_ohlcv("BTC/USDT:USDT", "1h", start_ts=18 * H)[:, 0].tolist() == [18 * H, 19 * H]
+    assert cache.get_ohlcv("BTC/USDT:USDT", "1h", end_ts=H // 2)[:, 0].tolist() == [0]
+    assert cache.get_ohlcv("BTC/USDT:USDT", "1h", start_ts=50 * H).shape == (0, 6)
+    assert cache.get_ohlcv("ETH/USDT:USDT", "1h").shape == (0, 6)
+
+def test_get_cached_range_partial_windows(cache, small_chunks):
+    cache.store_ohlcv("BTC/USDT:USDT", "1h", _bars(range(10 * H, 30 * H, H)))
+    rng = cache.get_cached_range
+    assert rng("BTC/USDT:USDT", "1h", 0, 100 * H) == (10 * H, 29 * H)
+    assert rng("BTC/USDT:USDT", "1h", 0, 15 * H + 1) == (10 * H, 15 * H)
+    assert rng("BTC/USDT:USDT", "1h", 12 * H - 1, 26 * H) == (12 * H, 26 * H)
+    assert rng("BTC/USDT:USDT", "1h", 25 * H + 1, 100 * H) == (26 * H, 29 * H)
+    assert rng("BTC/USDT:USDT", "1h", 12 * H + 1, 12 * H + 2) == (None, None)
+    assert rng("BTC/USDT:USDT", "1h", 40 * H, 50 * H) == (None, None)
+    assert rng("ETH/USDT:USDT", "1h", 0, 100 * H) == (None, None)
+
+@pytest.mark.parametrize("dirname", ["a?b", "c#d", "e%41f"])
+def test_reader_opens_paths_with_uri_characters(tmp_path, dirname):
+    c = OHLCVCache(tmp_path / dirname / "ohlcv.db")
+    try:
+        c.store_ohlcv("BTC/USDT:USDT", "1h", _bars([0, H]))
+        assert c.get_ohlcv("BTC/USDT:USDT", "1h")[:, 0].tolist() == [0, H]
+    finally:
+        c.close()
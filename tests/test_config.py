@@ -0,0 +1,72 @@
+import os
+import shutil
+import time
+from pathlib import Path
+
+import yaml
+
+from src import config as config_mod
+from src.config import load_config
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "config" / "config.yaml.example"
+
+def _fresh_process():
+    # A restart starts with an empty in-process cache; only the pickle survives
+    config_mod._CFG_CACHE.clear()
+
+def test_pickle_cache_not_served_after_copy2_rollback(tmp_path):
+    backup = tmp_path / "live.yaml.bak"
+    live = tmp_path / "live.yaml"
+    shutil.copy2(EXAMPLE, backup)
+    old = time.time() - 3600
+    os.utime(backup, (old, old))
+
+    live.write_text(EXAMPLE.read_text().replace("signal_power: 1.35", "signal_power: 9.99"))
+    _fresh_process()
+    assert load_config(str(live), use_cache=True).strategy.signal_power == 9.99
+
+    # Rollback keeps the backup's older mtime, so the pickle is "newer" than the YAML
+    shutil.copy2(backup, live)
+    _fresh_process()
+    assert load_config(str(live), use_cache=True).strategy.signal_power == 1.35
+
+def test_pickle_cache_hit_for_unchanged_yaml(tmp_path):
+    live = tmp_path / "live.yaml"
+    shutil.copy2(EXAMPLE, live)
+    _fresh_process()
+    first = load_config(str(live), use_cache=True)
+    assert (tmp_path / "live.yaml.pkl").exists()
+    _fresh_process()
+    assert load_config(str(live), use_cache=True) == first
+
+def _example_raw():
+    return config_mod._merge_defaults(yaml.safe_load(EXAMPLE.read_text()))
+
+def test_adaptive_scale_missing_tier_defaults_to_one():
+    raw = _example_raw()
+    raw["risk"]["adaptive"]["sl_scale"] = {"low": 1.3, "mid": 0.9}
+    sl = config_mod.AppConfig(**raw).risk.adaptive.sl_scale
+    assert (sl.low, sl.mid, sl.high) == (1.3, 0.9, 1.0)
+
+def test_model_dump_round_trips_frozenset_fields():
+    raw = _example_raw()
+    raw["strategy"]["symbol_filter"]["whitelist"] = ["ETH/USDT:USDT", "BTC/USDT:USDT"]
+    raw["strategy"]["time_of_day_whitelist"]["fixed_hours"] = [14, 3, 9]
+    cfg = config_mod.AppConfig(**raw)
+    d = cfg.model_dump()
+    assert d["strategy"]["symbol_filter"]["whitelist"] == ["BTC/USDT:USDT", "ETH/USDT:USDT"]
+    assert d["strategy"]["time_of_day_whitelist"]["fixed_hours"] == [3, 9, 14]
+    again = config_mod.AppConfig(**d)
+    assert again == cfg
+    assert again.strategy.symbol_filter.whitelist == frozenset({"BTC/USDT:USDT", "ETH/USDT:USDT"})
+
+def test_costs_legacy_bps_keys_alias_to_fee_fields():
+    raw = _example_raw()
+    raw["costs"] = {"maker_bps": 2.5, "taker_bps": 6.0}
+    costs = config_mod.AppConfig(**raw).costs
+    assert (costs.maker_fee_bps, costs.taker_fee_bps) == (2.5, 6.0)
+
+def test_costs_canonical_key_wins_over_legacy():
+    raw = _example_raw()
+    raw["costs"] = {"maker_fee_bps": 1.5, "maker_bps": 9.0}
+    assert config_mod.AppConfig(**raw).costs.maker_fee_bps == 1.5
@@ -0,0 +1,111 @@
+import time
+
+import ccxt
+import pytest
+from tenacity import wait_none
+
+from src import exchange as exchange_mod
+from src.config import ExchangeCfg
+from src.exchange import ExchangeWrapper
+
+def _no_network(self, *args, **kwargs):
+    raise AssertionError("unit test tried to reach the exchange")
+
+@pytest.fixture
+def ex(monkeypatch):
+    # __init__ loads markets; keep every test offline
+    monkeypatch.setattr(ccxt.bybit, "load_markets", lambda self, *a, **k: {})
+    monkeypatch.setattr(ccxt.bybit, "fetch", _no_network)
+    w = ExchangeWrapper(ExchangeCfg(id="bybit", account_type="swap", quote="USDT"))
+    yield w
+    w.close()
+
+def test_fetch_positions_ignores_contract_size_on_flat_rows(ex, monkeypatch):
+    rows = [
+        {"symbol": "BTC/USDT:USDT", "side": "long", "contracts": 0, "contractSize": 0.001, "entryPrice": None},
+        {"symbol": "ETH/USDT:USDT", "side": None, "contracts": None, "contractSize": 1, "entryPrice": None},
+        {"symbol": "SOL/USDT:USDT", "side": "short", "contracts": "3", "contractSize": 1, "entryPrice": "150"},
+    ]
+    monkeypatch.setattr(ex.x, "fetch_positions", lambda: rows)
+    pos = ex.fetch_positions()
+    assert pos["BTC/USDT:USDT"]["net_qty"] == 0.0
+    assert pos["ETH/USDT:USDT"]["net_qty"] == 0.0
+    assert pos["SOL/USDT:USDT"] == {"long_qty": 0.0, "short_qty": 3.0, "net_qty": -3.0, "entryPrice": 150.0}
+
+def _start_times(ex, n):
+    starts = []
+    def _req(_):
+        ex.x.throttle(1)
+        starts.append(time.monotonic())
+    list(ex._io_map(_req, range(n)))
+    return sorted(starts)
+
+def test_pooled_requests_are_spaced_by_rate_limit(ex):
+    ex.x.rateLimit = 50
+    ex.x.lastRestRequestTimestamp = 0
+    starts = _start_times(ex, 6)
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.045
+
+def test_rate_limit_error_pauses_all_requests(ex, monkeypatch):
+    monkeypatch.setattr(exchange_mod, "_RATE_LIMIT_PAUSE_S", 0.3)
+    ex.x.rateLimit = 1
+    t0 = time.monotonic()
+    assert ex._note_rate_limit(ccxt.RateLimitExceeded("bybit 10006 too many visits"))
+    assert not ex._note_rate_limit(ccxt.BadSymbol("nope"))
+    starts = _start_times(ex, 3)
+    assert starts[0] - t0 >= 0.28
+
+def test_funding_fallback_keeps_successes_and_pauses_on_rate_limit(ex, monkeypatch):
+    def fake_rate(s):
+        if s == "ETH/USDT:USDT":
+            raise ccxt.RateLimitExceeded("bybit 10006")
+        return {"fundingRate": "0.0001"}
+    monkeypatch.setattr(ex, "_has_fetch_funding_rates", False)
+    monkeypatch.setattr(ex, "_has_fetch_funding_rate", True)
+    monkeypatch.setattr(ex.x, "fetch_funding_rate", fake_rate)
+    out = ex.fetch_funding_rates(["BTC/USDT:USDT", "ETH/USDT:USDT"])
+    assert out == {"BTC/USDT:USDT": 0.0001}
+    assert ex._throttle_until > time.monotonic()
+
+def test_fetch_ohlcv_many_drops_failures_and_pauses_on_rate_limit(ex, monkeypatch):
+    calls = []
+    def fake_ohlcv(s, timeframe="1h", since=None, limit=None, params={}):
+        calls.append(s)
+        if s == "ETH/USDT:USDT":
+            raise ccxt.RateLimitExceeded('bybit {"retCode":10006,"retMsg":"Too many visits!"}')
+        return [[0, 1.0, 1.0, 1.0, 1.0, 1.0]]
+    # Real retry decorator, minus its backoff sleeps
+    monkeypatch.setattr(ExchangeWrapper.fetch_ohlcv.retry, "wait", wait_none())
+    monkeypatch.setattr(ex.x, "fetch_ohlcv", fake_ohlcv)
+    out = ex.fetch_ohlcv_many(["BTC/USDT:USDT", "ETH/USDT:USDT", "SOL/USDT:USDT"], "1h", 1)
+    assert list(out) == ["BTC/USDT:USDT", "SOL/USDT:USDT"]
+    assert calls.count("ETH/USDT:USDT") == 3
+    assert ex._throttle_until > time.monotonic()
+
+def _bybit_linear_market(symbol, qty_step, min_qty, amount_precision):
+    # Shape of ccxt 4.x bybit.market() for a USDT linear perp (TICK_SIZE precision mode)
+    return {
+        "symbol": symbol, "type": "swap", "swap": True, "linear": True, "contract": True,
+        "contractSize": 1.0,
+        "precision": {"amount": amount_precision, "price": 0.1},
+        "limits": {"amount": {"min": min_qty, "max": 1190.0}, "cost": {"min": 5.0}},
+        "info": {"lotSizeFilter": {"qtyStep": str(qty_step), "minOrderQty": str(min_qty)}},
+    }
+
+@pytest.mark.parametrize("symbol, qty_step, min_qty, prec, delta, sent", [
+    ("BTC/USDT:USDT", 0.001, 0.001, 0.001, 0.05, 0.05),
+    ("BTC/USDT:USDT", 0.001, 0.001, 0.001, 2.7, 2.7),
+    ("BTC/USDT:USDT", 0.001, 0.001, 0.001, 0.0519, 0.051),
+    ("1000PEPE/USDT:USDT", 100.0, 100.0, 100.0, 1234.5, 1200.0),
+    ("DOGE/USDT:USDT", 1.0, 1.0, 1.0, 2.7, 2.0),
+])
+def test_live_quantity_for_bybit_linear_markets(ex, monkeypatch, symbol, qty_step, min_qty, prec, delta, sent):
+    from src.live import _get_symbol_specs, _quantize_amount
+
+    monkeypatch.setattr(ex.x, "market", lambda s: _bybit_linear_market(s, qty_step, min_qty, prec))
+    # Same steps as the live rebalance loop
+    specs = _get_symbol_specs(ex, symbol, {})
+    q_to_send = _quantize_amount(abs(delta), float(specs["amount_step"]), bool(specs["integer_amount"]))
+    assert q_to_send == sent
+    assert specs["integer_amount"] is (qty_step >= 1)
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.validator import validate_before_backtest, validate_ohlcv
+
+H = 3_600_000
+
+def _bars(n=50, start=100.0, step=0.1):
+    return [[i * H, start + i * step, start + i * step + 1, start + i * step - 1, start + i * step + 0.5, 10.0]
+            for i in range(n)]
+
+def _has(msgs, text):
+    return any(text in m for m in msgs)
+
+def test_clean_bars_pass():
+    res = validate_ohlcv(_bars(), symbol="BTC")
+    assert res.is_valid() and res.warnings == [] and res.errors == []
+
+def test_dataframe_and_list_inputs_agree():
+    bars = _bars()
+    bars[10][3] = bars[10][1] + 5.0          # low above open -> OHLC error
+    del bars[20]                              # one missing bar -> gap warning
+    df = pd.DataFrame(bars, columns=["ts", "open", "high", "low", "close", "volume"])
+    a, b = validate_ohlcv(bars), validate_ohlcv(df)
+    assert (a.passed, a.errors, a.warnings) == (b.passed, b.errors, b.warnings)
+    assert _has(a.errors, "1 bars with invalid OHLC") and _has(a.warnings, "1 potential gaps")
+
+def test_dataframe_missing_columns_and_empty_inputs():
+    assert validate_ohlcv(pd.DataFrame({"open": [1.0]})).errors[0].startswith("Missing columns")
+    assert validate_ohlcv(pd.DataFrame()).errors == ["Empty DataFrame"]
+    assert validate_ohlcv([]).errors == ["Empty bar list"]
+
+def test_any_step_wider_than_one_interval_is_a_gap():
+    bars = _bars()
+    for i in range(25, len(bars)):
+        bars[i][0] += H // 20                 # a 1.05h step, inside the old 10% tolerance
+    res = validate_ohlcv(bars, timeframe="1h")
+    assert _has(res.warnings, "1 potential gaps")
+
+def test_negative_prices_skip_gap_and_spike_checks():
+    bars = _bars()
+    bars[5][4] = -1.0                         # negative close would also be a huge "spike"
+    del bars[30]                              # and a gap that is no longer reported
+    res = validate_ohlcv(bars)
+    assert not res.passed
+    assert _has(res.errors, "1 bars with negative prices")
+    assert "gap and spike checks skipped (negative prices)" in res.warnings
+    assert not _has(res.warnings, "gaps") and not _has(res.warnings, "spikes")
+
+def test_flat_series_skips_spike_check():
+    bars = [[i * H, 100.0, 100.0, 100.0, 100.0, 10.0] for i in range(50)]
+    bars[25][4] = bars[25][2] = 100.00001     # a sub-ppm tick would be a >5 sigma "spike"
+    assert validate_ohlcv(bars).warnings == []
+
+def test_spike_zscore_uses_sample_std():
+    closes = [100.0] * 30
+    closes[15] = 110.0
+    bars = [[i * H, c, c, c, c, 10.0] for i, c in enumerate(closes)]
+    r = np.log1p(np.diff(closes) / np.asarray(closes[:-1]))
+    z_sample = np.abs((r - r.mean()) / r.std(ddof=1)).max()
+    z_pop = np.abs((r - r.mean()) / r.std(ddof=0)).max()
+    between = (z_sample + z_pop) / 2
+    assert not _has(validate_ohlcv(bars, spike_zscore_threshold=between).warnings, "spikes")
+    assert _has(validate_ohlcv(bars, spike_zscore_threshold=z_sample - 1e-6).warnings, "spikes")
+
+def test_ohlc_check_ignores_nan_open_like_elementwise_compare():
+    ok = [[0, np.nan, 101.0, 100.0, 100.5, 1.0], [H, 100.0, 101.0, 100.0, 100.5, 1.0]]
+    bad = [[0, np.nan, 101.0, 100.0, 99.0, 1.0], [H, 100.0, 101.0, 100.0, 100.5, 1.0]]
+    assert not _has(validate_ohlcv(ok).errors, "invalid OHLC")
+    assert _has(validate_ohlcv(bad).errors, "1 bars with invalid OHLC")
+
+def test_unsorted_bars_are_checked_in_ts_order():
+    bars = _bars()
+    shuffled = [bars[i] for i in np.random.default_rng(0).permutation(len(bars))]
+    res = validate_ohlcv(shuffled)
+    assert res.warnings == [] and res.is_valid()
+
+@pytest.mark.parametrize("n_symbols", [3, 12])
+def test_validate_before_backtest_collects_errors_in_symbol_order(n_symbols):
+    cols = ["ts", "open", "high", "low", "close", "volume"]
+    frames = {f"S{i}": pd.DataFrame(_bars(), columns=cols) for i in range(n_symbols)}
+    bad = _bars()
+    bad[3][5] = -1.0
+    frames["S2"] = pd.DataFrame(bad, columns=cols)
+    frames["S1"] = pd.DataFrame(bad, columns=cols)
+    ok, errors = validate_before_backtest(frames, {})
+    assert not ok and errors == ["S1: 1 bars with negative volume", "S2: 1 bars with negative volume"]